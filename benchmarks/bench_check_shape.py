@@ -0,0 +1,46 @@
+"""
+Compares check_shape against the compiled validator from compile_shape
+on a folder with thousands of salary rows.
+
+Run with: python -m benchmarks.bench_check_shape
+"""
+import timeit
+from shape import shape_utils
+
+SHAPE = {
+  "folder": {
+    "datejoinedcomp": None,
+    "salary": [
+      {"datestarted": None}
+    ]
+  },
+  "inputs": {
+    "current_date": None
+  }
+}
+
+def make_folder(rows):
+  return {
+    "folder": {
+      "datejoinedcomp": "2000-04-01",
+      "salary": [{"datestarted": f"{2000 + i % 24}-04-01", "basicsalary": 25000 + i} for i in range(rows)]
+    },
+    "inputs": {
+      "current_date": "2024-03-31"
+    }
+  }
+
+def run(rows=5000, number=200):
+  data = make_folder(rows)
+  validator = shape_utils.compile_shape(SHAPE)
+  assert validator(data) == shape_utils.check_shape(SHAPE, data)
+
+  interpreted = timeit.timeit(lambda: shape_utils.check_shape(SHAPE, data), number=number)
+  compiled = timeit.timeit(lambda: validator(data), number=number)
+
+  print(f"{rows} salary rows, {number} calls")
+  print(f"  check_shape:   {interpreted / number * 1e6:10.1f} us/call")
+  print(f"  compile_shape: {compiled / number * 1e6:10.1f} us/call ({interpreted / compiled:.1f}x)")
+
+if __name__ == "__main__":
+  run()
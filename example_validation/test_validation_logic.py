@@ -108,3 +108,61 @@ def test_validate_empty_salary():
     result = validation_logic.validate_salary_records(data)
     assert result == expected_result
 
+
+def test_validate_batch_matches_single():
+    folders = [
+        {"datejoinedcomp": "2019-06-01", "salary": [
+            {"datestarted": "2019-06-01"},
+            {"datestarted": "2021-03-31"},
+            {"datestarted": "2021-04-01"}]},
+        {"datejoinedcomp": "2022-12-01", "salary": []},
+        {"datejoinedcomp": "2020-01-01", "salary": [
+            {"datestarted": "2019-04-01T00:00:00"},
+            {"datestarted": "2020-04-01T00:00:00"},
+            {"datestarted": "2021-04-01T00:00:00"},
+            {"datestarted": "2022-04-01T00:00:00"},
+            {"datestarted": "2023-04-01T00:00:00"}]},
+        {"datejoinedcomp": "2023-05-01", "salary": [
+            {"datestarted": None}]}
+    ]
+    inputs = {"current_date": "2024-03-31"}
+
+    expected = [validation_logic.validate_salary_records({"folder": folder, "inputs": inputs}) for folder in folders]
+    result = validation_logic.validate_salary_records({"folder": folders, "inputs": inputs})
+
+    assert result == expected
+    assert result[1] == {"outputs": {"validation_passed": "false", "missing_years": [2022, 2023]}}
+    assert result[2] == {"outputs": {"validation_passed": "true", "missing_years": []}}
+
+def test_validate_batch_with_missing_fields():
+    data = {
+        "folder": [{
+            "datejoinedcomp": "2022-12-01",
+            "salary": [{"datestarted": "2022-12-01"}]
+        },{
+            "salary": [{"datestarted": "2022-12-01"}]
+        }],
+        "inputs": {
+            "current_date": "2023-03-31"
+        }
+    }
+
+    result = validation_logic.validate_salary_records(data)
+
+    assert result[0] == {"outputs": {"validation_passed": "true", "missing_years": []}}
+    assert result[1]["input_missing"]["missing_keys"] == [{"key": "datejoinedcomp", "reason": "missing"}]
+
+def test_validate_salary_records_batch():
+    records = [
+        {"folder": {"datejoinedcomp": "2022-12-01", "salary": [{"datestarted": "2022-12-01"}]},
+         "inputs": {"current_date": "2024-03-31"}},
+        {"folder": {"datejoinedcomp": "2022-12-01", "salary": [{"datestarted": "12/01/2022"}]},
+         "inputs": {"current_date": "2023-03-31"}}
+    ]
+
+    result = validation_logic.validate_salary_records_batch(records)
+
+    assert result == [
+        {"outputs": {"validation_passed": "false", "missing_years": [2023]}},
+        {"outputs": {"validation_passed": "true", "missing_years": []}}
+    ]
@@ -61,4 +61,67 @@ def validate_salary_records(data):
           "validation_passed": str(all_present).lower(),
           "missing_years": missing_years
       }
-  }
\ No newline at end of file
+  }
+
+@validate_salary_records.batch
+def validate_salary_records_batch(records):
+  """
+  Batch version of validate_salary_records used when a list of folders is passed in.
+  Rather than building a DataFrame per folder, every folder's salary rows are flattened
+  in to one frame with a folder key, the financial years are worked out in one pass and
+  a single groupby finds which years each folder has. The results are then split back out
+  per folder and are identical to calling validate_salary_records on each folder.
+
+  Args:
+      records: List of inputs that have already passed the shape check.
+
+  Returns:
+      A list of outputs, one per record, in the same order.
+  """
+
+  # Flatten the salary rows of every folder, remembering which folder they came from
+  folder_keys = []
+  dates = []
+  for i, data in enumerate(records):
+    for salary in data['folder']['salary']:
+      folder_keys.append(i)
+      dates.append(salary['datestarted'])
+
+  # Years with at least one entry, per folder
+  years_present = {}
+  if dates:
+    df = pd.DataFrame({'folder': folder_keys, 'year': _financial_years(folder_keys, dates)})
+    for folder, year in df.groupby(['folder', 'year']).size().index:
+      years_present.setdefault(folder, set()).add(year)
+
+  results = []
+  for i, data in enumerate(records):
+    start_date = datetime.fromisoformat(data['folder']['datejoinedcomp'])
+    start_year = start_date.year - (start_date.month < 4)
+    end_date = datetime.fromisoformat(data['inputs']['current_date'])
+    end_year = end_date.year - (end_date.month < 4)
+
+    present = years_present.get(i, set())
+    missing_years = [year for year in range(start_year, end_year + 1) if year not in present]
+    all_present = len(data['folder']['salary']) > 0 and len(missing_years) == 0
+
+    results.append({
+        "outputs": {
+            "validation_passed": str(all_present).lower(),
+            "missing_years": missing_years
+        }
+    })
+
+  return results
+
+def _financial_years(folder_keys, dates):
+  # Financial year (starting 1st April) for each date.
+  # pd.to_datetime infers the date format from the first value, so if the folders don't
+  # all share a format we parse each folder on its own - as validate_salary_records would
+  try:
+    started = pd.to_datetime(pd.Series(dates))
+  except (ValueError, TypeError):
+    folders = pd.Series(dates).groupby(folder_keys, sort=False)
+    started = pd.concat([pd.to_datetime(group) for _, group in folders]).sort_index()
+
+  return started.dt.year - (started.dt.month < 4)
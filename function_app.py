@@ -2,6 +2,7 @@ import azure.functions as func
 import json
 from example_validation import validation_logic
 from shape import shape_utils
+from shape.connection_pool import ConnectionPool
 import pymssql
 import os
 
@@ -10,6 +11,14 @@ user = os.environ.get('SHAPE_USER')
 password = os.environ.get('SHAPE_USER_PASSWORD')
 database = os.environ.get('SHAPE_DATABASE')
 
+# Connections are shared by every invocation on this worker
+pool = ConnectionPool(
+  lambda: pymssql.connect(server_name,user,password,database),
+  max_size=int(os.environ.get('SHAPE_POOL_SIZE', 5)),
+  idle_timeout=float(os.environ.get('SHAPE_POOL_IDLE_TIMEOUT', 300)),
+  health_check_interval=float(os.environ.get('SHAPE_POOL_HEALTH_CHECK_INTERVAL', 30)),
+  acquire_timeout=float(os.environ.get('SHAPE_POOL_ACQUIRE_TIMEOUT', 30)))
+
 
 app = func.FunctionApp()
 
@@ -48,8 +57,8 @@ def query_http(req: func.HttpRequest) -> func.HttpResponse:
     sql, bind_vars = shape_utils.create_sql(data);
     sql = f"SELECT CAST (({sql}) AS NVARCHAR(MAX))"
     
-    # Connect to SQL Server database using integrated security
-    with pymssql.connect(server_name,user,password,database) as conn:
+    # Borrow a connection to the SQL Server database from the pool
+    with pool.connection() as conn:
       with conn.cursor() as cursor:
         cursor.execute(sql, bind_vars)
         row = cursor.fetchone()
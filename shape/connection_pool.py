@@ -0,0 +1,158 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class ConnectionPool:
+  """
+  A bounded, thread safe pool of DB-API connections shared by every invocation on a worker.
+
+  Connections are handed out most recently used first, so the rest of the pool goes idle
+  and gets evicted once it has been idle for longer than idle_timeout. A connection that
+  has been idle for longer than health_check_interval is checked with a cheap query before
+  being handed out, and is replaced if the check fails.
+
+  Args:
+      connect: Function taking no arguments that opens a new connection.
+      max_size: The most connections that can be open at once.
+      idle_timeout: Seconds a connection can sit idle in the pool before it is closed.
+      health_check_interval: Seconds idle after which a connection is checked before use.
+      acquire_timeout: Seconds to wait for a connection when the pool is exhausted.
+      health_check_sql: The query used to check a connection.
+      clock: Function returning the current time in seconds, used to age idle connections
+          (default: time.monotonic).
+  """
+  def __init__(self, connect, max_size=5, idle_timeout=300, health_check_interval=30,
+               acquire_timeout=30, health_check_sql="SELECT 1", clock=time.monotonic):
+    if max_size < 1:
+      raise ValueError("max_size must be at least 1")
+    self.connect = connect
+    self.max_size = max_size
+    self.idle_timeout = idle_timeout
+    self.health_check_interval = health_check_interval
+    self.acquire_timeout = acquire_timeout
+    self.health_check_sql = health_check_sql
+    self.clock = clock
+    self._idle = []  # (connection, time returned to the pool) - most recently used last
+    self._size = 0
+    self._lock = threading.Condition()
+
+  @property
+  def size(self):
+    """The number of open connections, in use or idle."""
+    return self._size
+
+  @property
+  def idle(self):
+    """The number of open connections waiting in the pool."""
+    return len(self._idle)
+
+  @contextmanager
+  def connection(self):
+    """
+    Borrows a connection from the pool for the duration of a with block.
+
+    If the block raises, the connection is closed rather than returned to the pool
+    as its state can't be trusted.
+    """
+    conn = self.acquire()
+    try:
+      yield conn
+    except BaseException:
+      self.discard(conn)
+      raise
+    else:
+      self.release(conn)
+
+  def acquire(self):
+    """
+    Takes a connection from the pool, opening a new one if the pool isn't full.
+
+    Raises:
+        TimeoutError: If no connection becomes free within acquire_timeout seconds.
+    """
+    deadline = time.monotonic() + self.acquire_timeout
+    while True:
+      with self._lock:
+        self._evict_idle()
+        if self._idle:
+          conn, returned_at = self._idle.pop()
+        elif self._size < self.max_size:
+          conn, returned_at = None, None
+          self._size += 1
+        else:
+          remaining = deadline - time.monotonic()
+          if remaining <= 0:
+            raise TimeoutError(f"Timed out waiting for a database connection (pool size {self.max_size})")
+          self._lock.wait(remaining)
+          continue
+
+      if conn is None:
+        try:
+          return self.connect()
+        except BaseException:
+          self._forget()
+          raise
+
+      if self.clock() - returned_at < self.health_check_interval or self._healthy(conn):
+        return conn
+
+      # Stale connection - close it and go round again for another
+      self.discard(conn)
+
+  def release(self, conn):
+    """Returns a healthy connection to the pool."""
+    try:
+      conn.rollback()
+    except Exception:
+      self.discard(conn)
+      return
+
+    with self._lock:
+      self._idle.append((conn, self.clock()))
+      self._evict_idle()
+      self._lock.notify()
+
+  def discard(self, conn):
+    """Closes a connection taken from the pool instead of returning it."""
+    _close(conn)
+    self._forget()
+
+  def close(self):
+    """Closes every idle connection in the pool."""
+    with self._lock:
+      idle, self._idle = self._idle, []
+      self._size -= len(idle)
+      self._lock.notify_all()
+    for conn, _ in idle:
+      _close(conn)
+
+  def _forget(self):
+    with self._lock:
+      self._size -= 1
+      self._lock.notify()
+
+  def _evict_idle(self):
+    # Called with the lock held. Idle connections are oldest first.
+    cutoff = self.clock() - self.idle_timeout
+    while self._idle and self._idle[0][1] < cutoff:
+      conn, _ = self._idle.pop(0)
+      self._size -= 1
+      _close(conn)
+
+  def _healthy(self, conn):
+    try:
+      cursor = conn.cursor()
+      try:
+        cursor.execute(self.health_check_sql)
+        cursor.fetchall()
+      finally:
+        cursor.close()
+      return True
+    except Exception:
+      return False
+
+def _close(conn):
+  try:
+    conn.close()
+  except Exception:
+    pass
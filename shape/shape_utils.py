@@ -1,6 +1,7 @@
 import json
 from typing import Dict
 import string
+from functools import partial
 
 allowed_chars = set(string.ascii_letters + string.digits + '_')
 
@@ -19,8 +20,17 @@ def sanitize_name(name):
 def shape(shape):
   """
   Decorator to define the required shape for a function.
+
+  A calc can also register a batch implementation with @calc.batch. When the
+  input holds a list, every permutation that passes the shape check is handed
+  to the batch implementation in one call instead of calling the calc once per
+  permutation. The batch implementation must return one result per input, in
+  the same order.
   """
   def decorator(func):
+    # The shape never changes, so compile its validator once
+    validator = compile_shape(shape)
+
     def wrapped_func(data):
       # Top level should always be a dictionary of dictionaries
       # If one of them is a list - we need to permutate and loop each one and create a list
@@ -32,14 +42,26 @@ def shape(shape):
 
         # Create a list of dictionaries with all combinations of list elements
         permutations = [{**data, list_key: item} for item in list_values]
-        return [validate_with_shape(func, shape, input) for input in permutations]
+        if wrapped_func.batch_func is not None:
+          return validate_batch_with_shape(wrapped_func.batch_func, shape, permutations, validator)
+        return [validate_with_shape(func, shape, input, validator) for input in permutations]
       else:
-        return validate_with_shape(func, shape, data)
+        return validate_with_shape(func, shape, data, validator)
+
+    def batch(batch_func):
+      wrapped_func.batch_func = batch_func
+      return batch_func
+
+    wrapped_func.batch_func = None
+    wrapped_func.batch = batch
     return wrapped_func  
   return decorator
 
-def validate_with_shape(func, shape, data):
-  match, missing_keys = check_shape(shape, data)
+def validate_with_shape(func, shape, data, validator=None):
+  if validator is None:
+    validator = partial(check_shape, shape)
+
+  match, missing_keys = validator(data)
   if not match:
     return {"input_missing": {
       "required": shape,
@@ -48,6 +70,41 @@ def validate_with_shape(func, shape, data):
   
   return func(data)
 
+def validate_batch_with_shape(batch_func, shape, inputs, validator=None):
+  """
+  Checks the shape of every input and runs the ones that match through a batch function.
+
+  Args:
+      batch_func: Function taking a list of inputs and returning a list of results in the same order.
+      shape: The required shape of each input.
+      inputs: List of inputs to validate.
+      validator: Compiled validator for the shape (default: compiled from shape).
+
+  Returns:
+      A list with one result per input - either the batch result or the input_missing report.
+  """
+  if validator is None:
+    validator = partial(check_shape, shape)
+
+  results = [None] * len(inputs)
+  valid_indexes = []
+  for i, data in enumerate(inputs):
+    match, missing_keys = validator(data)
+    if match:
+      valid_indexes.append(i)
+    else:
+      results[i] = {"input_missing": {
+        "required": shape,
+        "missing_keys": missing_keys
+      }}
+
+  if valid_indexes:
+    batch_results = batch_func([inputs[i] for i in valid_indexes])
+    for i, result in zip(valid_indexes, batch_results):
+      results[i] = result
+
+  return results
+
 def check_shape(required_shape, actual_input):
     # Recursively check for matching keys and types
     def check_nested(required, actual):
@@ -74,6 +131,70 @@ def check_shape(required_shape, actual_input):
     # Return result and any missing keys
     return len(missing_keys) == 0, missing_keys
 
+def compile_shape(required_shape):
+  """
+  Compiles a shape in to a validator so the shape dict isn't walked again on every call.
+
+  The shape is turned in to a plan of the keys each object must have, the nested objects
+  and the lists to check. Valid input (the usual case) is checked against the plan without
+  building any reports. Only when the input doesn't match is check_shape run to build the
+  missing keys report, so the result is always the same as check_shape.
+
+  Args:
+      required_shape: A dictionary representing the required shape.
+
+  Returns:
+      A function taking the input and returning (match, missing_keys) like check_shape.
+  """
+  plan = _compile_plan(required_shape)
+
+  def validator(actual_input):
+    if _matches_plan(plan, actual_input):
+      return True, []
+    return check_shape(required_shape, actual_input)
+
+  return validator
+
+def _compile_plan(required):
+  # A plan is (keys that must be present, (key, plan) for nested objects,
+  # (key, plan or None) for lists - None when the list items aren't checked)
+  objects = []
+  lists = []
+  for key, req_value in required.items():
+    if isinstance(req_value, dict):
+      objects.append((key, _compile_plan(req_value)))
+    elif isinstance(req_value, list):
+      if len(req_value) > 0 and isinstance(req_value[0], dict):
+        lists.append((key, _compile_plan(req_value[0])))
+      else:
+        lists.append((key, None))
+  return frozenset(required.keys()), tuple(objects), tuple(lists)
+
+def _matches_plan(plan, actual):
+  keys, objects, lists = plan
+  if not isinstance(actual, dict) or not actual.keys() >= keys:
+    return False
+  for key, nested_plan in objects:
+    if not _matches_plan(nested_plan, actual[key]):
+      return False
+  for key, item_plan in lists:
+    items = actual[key]
+    if not isinstance(items, list):
+      return False
+    if item_plan is None:
+      continue
+    item_keys, item_objects, item_lists = item_plan
+    if item_objects or item_lists:
+      for item in items:
+        if not _matches_plan(item_plan, item):
+          return False
+    else:
+      # Flat rows (e.g. salary history) - just check the keys of each row
+      for item in items:
+        if not isinstance(item, dict) or not item.keys() >= item_keys:
+          return False
+  return True
+
 def create_sql(required_shape, id_param_name=None):
   """
   Creates a SQL statement string based on a UPM object shape definition.
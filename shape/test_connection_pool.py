@@ -0,0 +1,157 @@
+import pytest
+import threading
+from shape.connection_pool import ConnectionPool
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql, params=None):
+        if self.connection.broken:
+            raise OSError("connection reset")
+        self.connection.executed.append(sql)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self):
+        self.broken = False
+        self.closed = False
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        if self.broken:
+            raise OSError("connection reset")
+
+    def close(self):
+        self.closed = True
+
+class FakeDriver:
+    def __init__(self):
+        self.connections = []
+
+    def connect(self):
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_pool(**kwargs):
+    driver = FakeDriver()
+    clock = FakeClock()
+    pool = ConnectionPool(driver.connect, clock=clock, **kwargs)
+    return pool, driver, clock
+
+def test_reuses_connection():
+    pool, driver, _ = make_pool()
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert len(driver.connections) == 1
+    assert pool.size == 1
+    assert pool.idle == 1
+
+def test_bounded_size():
+    pool, driver, _ = make_pool(max_size=2, acquire_timeout=0.01)
+
+    first = pool.acquire()
+    second = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(driver.connections) == 2
+
+def test_waits_for_released_connection():
+    pool, driver, _ = make_pool(max_size=1, acquire_timeout=5)
+    conn = pool.acquire()
+    acquired = []
+
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+    pool.release(conn)
+    waiter.join(5)
+
+    assert acquired == [conn]
+
+def test_idle_eviction():
+    pool, driver, clock = make_pool(idle_timeout=60)
+    with pool.connection():
+        pass
+
+    clock.now = 61
+    with pool.connection() as conn:
+        pass
+
+    assert driver.connections[0].closed
+    assert conn is driver.connections[1]
+    assert pool.size == 1
+
+def test_health_check_replaces_broken_connection():
+    pool, driver, clock = make_pool(health_check_interval=10)
+    with pool.connection() as conn:
+        pass
+
+    # Recently used connections aren't checked
+    clock.now = 5
+    with pool.connection() as again:
+        pass
+    assert again is conn
+    assert conn.executed == []
+
+    conn.broken = True
+    clock.now = 20
+    with pool.connection() as replaced:
+        pass
+
+    assert replaced is not conn
+    assert conn.closed
+    assert pool.size == 1
+
+def test_error_discards_connection():
+    pool, driver, _ = make_pool()
+
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("bad query")
+
+    assert driver.connections[0].closed
+    assert pool.size == 0
+
+def test_failed_connect_frees_slot():
+    def connect():
+        raise OSError("login failed")
+
+    pool = ConnectionPool(connect, max_size=1, acquire_timeout=0.01)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            pool.acquire()
+    assert pool.size == 0
+
+def test_close():
+    pool, driver, _ = make_pool()
+    with pool.connection():
+        pass
+
+    pool.close()
+
+    assert driver.connections[0].closed
+    assert pool.size == 0
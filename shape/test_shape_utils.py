@@ -283,4 +283,60 @@ def test_convert_object_from_jsonload():
 def test_convert_empty_lists():
     result = [{"emptything1": None}]
     converted = shape_utils.convert_lists_to_objects(result)
-    assert converted == {"emptything1": []}
\ No newline at end of file
+    assert converted == {"emptything1": []}
+def test_shape_batch():
+    calls = []
+
+    @shape_utils.shape({"folder": {"ref": None}})
+    def calc(data):
+        return data["folder"]["ref"]
+
+    @calc.batch
+    def calc_batch(inputs):
+        calls.append(len(inputs))
+        return [data["folder"]["ref"].upper() for data in inputs]
+
+    result = calc({"folder": [{"ref": "a"}, {"wrong": "b"}, {"ref": "c"}]})
+
+    assert calls == [2]
+    assert result[0] == "A"
+    assert result[1]["input_missing"]["missing_keys"] == [{"key": "ref", "reason": "missing"}]
+    assert result[2] == "C"
+    assert calc({"folder": {"ref": "a"}}) == "a"
+
+def test_compile_shape():
+    shape = {
+        "folder": {
+            "datejoinedcomp": None,
+            "payroll": {"payrollname": None},
+            "salary": [{"datestarted": None}],
+            "notes": []
+        },
+        "inputs": {"current_date": None}
+    }
+    validator = shape_utils.compile_shape(shape)
+
+    valid = {
+        "folder": {
+            "datejoinedcomp": "2022-12-01",
+            "payroll": {"payrollname": "Main"},
+            "salary": [{"datestarted": "2022-12-01"}, {"datestarted": "2023-04-01", "extra": 1}],
+            "notes": ["a"]
+        },
+        "inputs": {"current_date": "2024-03-31"},
+        "extra": {}
+    }
+    assert validator(valid) == (True, [])
+
+    invalid_inputs = [
+        {"inputs": {"current_date": "2024-03-31"}},
+        {**valid, "folder": []},
+        {**valid, "folder": {**valid["folder"], "payroll": "Main"}},
+        {**valid, "folder": {**valid["folder"], "salary": {"datestarted": "2022-12-01"}}},
+        {**valid, "folder": {**valid["folder"], "salary": [{"datestarted": "2022-12-01"}, {}]}},
+        {**valid, "folder": {**valid["folder"], "notes": None}},
+    ]
+    for data in invalid_inputs:
+        match, missing_keys = validator(data)
+        assert match == False
+        assert (match, missing_keys) == shape_utils.check_shape(shape, data)